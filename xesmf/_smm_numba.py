@@ -0,0 +1,84 @@
+"""
+Threaded sparse matrix multiplication (SMM) kernel compiled with numba.
+
+scipy.sparse applies CSR weights with a single-threaded C routine. The
+kernel here parallelizes over output rows with ``numba.prange``, and the
+inner loop over the batched extra dimensions is a dense contiguous AXPY
+that numba auto-vectorizes. For data with non-trivial extra dimensions
+this scales close to linearly with the number of cores.
+
+The kernels are compiled with ``cache=True``, so the machine code is
+written to ``__pycache__`` on first use and reloaded by later processes,
+avoiding the one-time JIT cost in short-lived sessions (CLI tools,
+freshly started dask workers).
+"""
+import numba as nb
+import numpy as np
+
+
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def _apply_csr_kernel(indptr, indices, data, X, Y):
+    # Y[i, :] = sum over the i-th CSR row of data[k] * X[indices[k], :]
+    for i in nb.prange(Y.shape[0]):
+        for k in range(indptr[i], indptr[i + 1]):
+            Y[i, :] += data[k] * X[indices[k], :]
+
+
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def _apply_csr_kernel_batchmajor(indptr, indices, data, XT, YT):
+    # XT is (B, N_in) and YT is (B, N_out), both C-contiguous: each
+    # output element is a gather-reduce along a contiguous input row.
+    for b in nb.prange(XT.shape[0]):
+        for i in range(YT.shape[1]):
+            acc = YT[b, i]
+            for k in range(indptr[i], indptr[i + 1]):
+                acc += data[k] * XT[b, indices[k]]
+            YT[b, i] = acc
+
+
+def apply_csr(weights, X):
+    """
+    Compute ``weights @ X`` with a threaded numba kernel.
+
+    C-contiguous input goes through a row-parallel kernel whose inner
+    AXPY runs over contiguous rows. F-contiguous input (the usual case
+    when Fortran-ordered fields are flattened with a free ``order='F'``
+    reshape) is handled by a batch-parallel kernel operating on the
+    transposed views, so no layout copy is materialized on either side.
+
+    Parameters
+    ----------
+    weights : scipy.sparse.csr_matrix
+        Regridding weights of shape ``(N_out, N_in)``.
+
+    X : numpy array of shape ``(N_in, B)``
+        Input data with all extra dimensions flattened into the batch
+        dimension ``B``.
+
+    Returns
+    -------
+    Y : numpy array of shape ``(N_out, B)``
+        C-ordered for C-contiguous input, F-ordered for F-contiguous
+        input, so unflattening with the matching order stays a view.
+    """
+
+    # Limitation from numba : some big-endian dtypes are not supported.
+    try:
+        nb.from_dtype(X.dtype)
+        nb.from_dtype(weights.dtype)
+    except (NotImplementedError, nb.core.errors.NumbaError):
+        return weights.dot(X)
+
+    dtype = np.result_type(weights.dtype, X.dtype)
+
+    if X.flags['F_CONTIGUOUS'] and not X.flags['C_CONTIGUOUS']:
+        # X.T and Y.T are C-contiguous views: transposing is just a
+        # stride change, no data moves
+        Y = np.zeros((weights.shape[0], X.shape[1]), dtype=dtype, order='F')
+        _apply_csr_kernel_batchmajor(weights.indptr, weights.indices, weights.data, X.T, Y.T)
+        return Y
+
+    X = np.ascontiguousarray(X)
+    Y = np.zeros((weights.shape[0], X.shape[1]), dtype=dtype)
+    _apply_csr_kernel(weights.indptr, weights.indices, weights.data, X, Y)
+    return Y
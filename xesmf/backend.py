@@ -15,8 +15,11 @@ ESMPy is hard to debug because the program often dies in the Fortran level.
 So it would be helpful to catch some common mistakes in Python level.
 """
 
+import hashlib
 import os
 import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import esmpy as ESMF
@@ -24,21 +27,76 @@ except ImportError:
     import ESMF
 import numpy as np
 import numpy.lib.recfunctions as nprec
+import scipy.sparse
+
+from ._smm_numba import apply_csr
+
+try:
+    import cupy
+    import cupyx.scipy.sparse
+
+    cupy_array_type = (cupy.ndarray,)  # for isinstance checks
+except ImportError:
+    cupy_array_type = ()
+
+
+# Threshold above which mismatched-order field copies go through the
+# blocked, threaded relayout instead of a plain numpy assignment.
+RELAYOUT_NBYTES_THRESHOLD = 64 * 2**20
+# ~L2-sized tiles: 256x256 float64 values = 512 KiB
+RELAYOUT_BLOCK = 256
+
+
+def _relayout_blocked(dst, src, block=RELAYOUT_BLOCK):
+    """
+    Copy ``src`` into ``dst`` tile by tile, with tiles spread over threads.
+
+    A plain ``dst[...] = src`` between arrays of mismatched memory order
+    degrades badly for large fields: numpy's transposing copy is
+    single-threaded and cache-unfriendly. Tiling the two leading axes
+    keeps each tile in cache, and the tiles are independent so they can
+    be copied concurrently (numpy releases the GIL for the bulk copy).
+
+    Parameters
+    ----------
+    dst, src : numpy arrays
+        Must have identical shapes and at least 2 dimensions.
+
+    block : int, optional
+        Tile edge length along each of the two leading axes.
+    """
+    nx, ny = src.shape[:2]
+    with ThreadPoolExecutor() as pool:
+        futures = [
+            pool.submit(
+                np.copyto,
+                dst[i : i + block, j : j + block],
+                src[i : i + block, j : j + block],
+            )
+            for i in range(0, nx, block)
+            for j in range(0, ny, block)
+        ]
+        for future in futures:
+            future.result()
 
 
 def warn_f_contiguous(a):
     """
     Give a warning if input array if not Fortran-ordered.
 
-    ESMPy expects Fortran-ordered array. Passing C-ordered array will slow down
-    performance due to memory rearrangement.
+    ESMPy expects Fortran-ordered array. C-ordered input is accepted,
+    but is copied to Fortran order first, which costs one extra relayout
+    of the array.
+
+    The check is compiled out entirely when running python with ``-O``,
+    so it costs nothing in optimized production runs.
 
     Parameters
     ----------
     a : numpy array
     """
-    if not a.flags['F_CONTIGUOUS']:
-        warnings.warn('Input array is not F_CONTIGUOUS. ' 'Will affect performance.')
+    if __debug__ and not a.flags['F_CONTIGUOUS']:
+        warnings.warn('Input array is not F_CONTIGUOUS. ' 'Will be copied to Fortran order.')
 
 
 def warn_lat_range(lat):
@@ -56,6 +114,32 @@ def warn_lat_range(lat):
         warnings.warn('Latitude is outside of [-90, 90]')
 
 
+def _bulk_set_grid_coords(grid, coords, staggerloc):
+    """
+    Write coordinate arrays into the Fortran-side pointers of a grid.
+
+    Groups the ``get_coords()`` pointer lookups and the assignments in
+    one place, shared by the cell-center (``Grid.from_xarray()``) and
+    cell-corner (``add_corner()``) writes.
+
+    Parameters
+    ----------
+    grid : ESMF.Grid object
+
+    coords : sequence of numpy arrays
+        One array per coordinate dimension, i.e. ``[lon, lat]``.
+
+    staggerloc : ESMF.StaggerLoc
+        Location of the coordinates (CENTER for cell centers,
+        CORNER for cell corners).
+    """
+    pointers = [grid.get_coords(coord_dim=i, staggerloc=staggerloc) for i in range(len(coords))]
+
+    # Use [...] to avoid overwritting the object. Only change array values.
+    for pointer, coord in zip(pointers, coords):
+        pointer[...] = coord
+
+
 class Grid(ESMF.Grid):
     @classmethod
     def from_xarray(cls, lon, lat, periodic=False, mask=None):
@@ -93,6 +177,12 @@ class Grid(ESMF.Grid):
         for a in [lon, lat]:
             warn_f_contiguous(a)
 
+        # Relayout C-ordered input once upfront; the element-wise copy into
+        # the Fortran-ordered pointers below would otherwise walk the target
+        # with a cache-thrashing stride pattern.
+        lon = np.asfortranarray(lon)
+        lat = np.asfortranarray(lat)
+
         warn_lat_range(lat)
 
         # ESMF.Grid can actually take 3D array (lon, lat, radius),
@@ -112,7 +202,9 @@ class Grid(ESMF.Grid):
         # However, they actually need to be set explicitly,
         # otherwise grid._coord_sys and grid._staggerloc will still be None.
         grid = cls(
-            np.array(lon.shape),
+            # int32 is what ESMF expects; a default int64 array would be
+            # allocated just to be converted again
+            np.asarray(lon.shape, dtype=np.int32),
             staggerloc=staggerloc,
             coord_sys=ESMF.CoordSys.SPH_DEG,
             num_peri_dims=num_peri_dims,
@@ -120,12 +212,7 @@ class Grid(ESMF.Grid):
 
         # The grid object points to the underlying Fortran arrays in ESMF.
         # To modify lat/lon coordinates, need to get pointers to them
-        lon_pointer = grid.get_coords(coord_dim=0, staggerloc=staggerloc)
-        lat_pointer = grid.get_coords(coord_dim=1, staggerloc=staggerloc)
-
-        # Use [...] to avoid overwritting the object. Only change array values.
-        lon_pointer[...] = lon
-        lat_pointer[...] = lat
+        _bulk_set_grid_coords(grid, [lon, lat], staggerloc)
 
         # Follows SCRIP convention where 1 is unmasked and 0 is masked.
         # See https://github.com/NCPP/ocgis/blob/61d88c60e9070215f28c1317221c2e074f8fb145/src/ocgis/regrid/base.py#L391-L404
@@ -210,22 +297,24 @@ def add_corner(grid, lon_b, lat_b):
     for a in [lon_b, lat_b]:
         warn_f_contiguous(a)
 
+    # same upfront relayout as in Grid.from_xarray()
+    lon_b = np.asfortranarray(lon_b)
+    lat_b = np.asfortranarray(lat_b)
+
     warn_lat_range(lat_b)
 
     assert lon_b.ndim == 2, 'Input grid must be 2D array'
     assert lon_b.shape == lat_b.shape, 'lon_b and lat_b must have same shape'
-    assert np.array_equal(lon_b.shape, grid.max_index + 1), 'lon_b should be size (Nx+1, Ny+1)'
+    # plain tuple compare; np.array_equal would build two temporary arrays
+    # just to compare two small shapes
+    assert lon_b.shape == tuple(grid.max_index + 1), 'lon_b should be size (Nx+1, Ny+1)'
     assert (grid.num_peri_dims == 0) and (
         grid.periodic_dim is None
     ), 'Cannot add corner for periodic grid'
 
     grid.add_coords(staggerloc=staggerloc)
 
-    lon_b_pointer = grid.get_coords(coord_dim=0, staggerloc=staggerloc)
-    lat_b_pointer = grid.get_coords(coord_dim=1, staggerloc=staggerloc)
-
-    lon_b_pointer[...] = lon_b
-    lat_b_pointer[...] = lat_b
+    _bulk_set_grid_coords(grid, [lon_b, lat_b], staggerloc)
 
 
 class Mesh(ESMF.Mesh):
@@ -312,6 +401,226 @@ class Mesh(ESMF.Mesh):
         return (self.size[loc], 1)
 
 
+def _read_weights_file(filename, n_in=None, n_out=None):
+    """
+    Read the factor indices and values from an offline weight file
+    written by ESMF.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the weights netCDF file.
+
+    n_in, n_out : integers, optional
+        Expected total number of source/destination grid boxes. If given
+        and the file records its grid sizes (dimensions ``n_a``/``n_b``),
+        a mismatch raises a ValueError. This catches stale weight files
+        computed for different grids before they produce silently wrong
+        regridding.
+
+    Returns
+    -------
+    row, col : numpy arrays of integers
+        0-based destination/source indices of the weights.
+
+    s : numpy array
+        Weight values.
+    """
+    # xarray is imported lazily to keep this backend numpy-only
+    # for the common in-memory case.
+    import xarray as xr
+
+    ds_w = xr.open_dataset(filename)
+
+    if (n_in is not None) and ('n_a' in ds_w.sizes) and (ds_w.sizes['n_a'] != n_in):
+        raise ValueError(
+            'Weights file was generated for a source grid of size {}, '
+            'but the source grid has size {}: {}'.format(ds_w.sizes['n_a'], n_in, filename)
+        )
+    if (n_out is not None) and ('n_b' in ds_w.sizes) and (ds_w.sizes['n_b'] != n_out):
+        raise ValueError(
+            'Weights file was generated for a destination grid of size {}, '
+            'but the destination grid has size {}: {}'.format(ds_w.sizes['n_b'], n_out, filename)
+        )
+
+    row = ds_w['row'].values - 1  # Python starts with 0
+    col = ds_w['col'].values - 1
+    s = ds_w['S'].values
+    return row, col, s
+
+
+class RegridPlan:
+    """
+    Weights-only result of ``esmf_regrid_build(..., return_plan=True)``.
+
+    Holds the regridding weights as a scipy.sparse CSR matrix together
+    with the grid shapes, after the ESMF regrid and field objects have
+    been destroyed. This frees the Fortran-side memory proportional to
+    the grid size that a live ESMF.Regrid keeps tied up, and so allows
+    holding many regridders in one process.
+    """
+
+    def __init__(self, weights, shape_in, shape_out):
+        self.weights = weights
+        self.shape_in = shape_in
+        self.shape_out = shape_out
+
+
+def _make_field(grid, extra_dims):
+    """Create an ESMF.Field on a Grid, Mesh or LocStream object."""
+    if isinstance(grid, ESMF.Mesh):
+        return ESMF.Field(grid, meshloc=ESMF.MeshLoc.ELEMENT, ndbounds=extra_dims)
+    return ESMF.Field(grid, ndbounds=extra_dims)
+
+
+def _field_data_shape(grid):
+    """
+    Shape of the data of a Field built on ``grid``, without extra
+    dimensions: 2D for a Grid, 1D for a Mesh or LocStream.
+
+    Unlike the ``get_shape()`` methods (which pad Mesh/LocStream shapes
+    to ``(n, 1)``), this matches ``field.data.shape`` exactly, which is
+    what ``esmf_regrid_apply()`` uses to split off the extra dimensions.
+    """
+    if isinstance(grid, ESMF.Mesh):
+        return (grid.size[ESMF.MeshLoc.ELEMENT],)
+    if isinstance(grid, ESMF.LocStream):
+        return (grid.size,)
+    return grid.get_shape()
+
+
+def _get_pooled_fields(regrid, extra_shape):
+    """
+    Return ``(sourcefield, destfield)`` matching the trailing (extra)
+    dimensions of the data, reusing previously created fields if any.
+
+    Fortran-side Field allocation is expensive. When the same regrid is
+    applied to many data chunks with varying extra dimensions (e.g. a
+    chunked dask graph), pooling the fields per shape amortizes it.
+
+    This relies on ESMF applying a stored routehandle to field pairs
+    other than the ones it was computed for, as long as they live on the
+    same grids and differ only in their ungridded (extra) dimensions --
+    "weakly congruent" fields in ESMF terms. Fields on different grids
+    are not supported and must use their own regrid.
+
+    Parameters
+    ----------
+    regrid : ESMF.Regrid object
+        Generated by ``esmf_regrid_build()``.
+
+    extra_shape : tuple of integers
+        Extra dimensions of the data, i.e. everything beyond the grid
+        dimensions. Empty tuple for purely horizontal data.
+
+    Returns
+    -------
+    sourcefield, destfield : ESMF.Field objects
+    """
+    fields = regrid._field_pool.get(extra_shape)
+    if fields is None:
+        fields = (
+            _make_field(regrid.srcfield.grid, list(extra_shape) or None),
+            _make_field(regrid.dstfield.grid, list(extra_shape) or None),
+        )
+        regrid._field_pool[extra_shape] = fields
+    return fields
+
+
+# use shorter, clearer names for options in ESMF.RegridMethod
+# (built once at import; esmf_regrid_build can be called in tight loops)
+_method_dict = {
+    'bilinear': ESMF.RegridMethod.BILINEAR,
+    'conservative': ESMF.RegridMethod.CONSERVE,
+    'conservative_normed': ESMF.RegridMethod.CONSERVE,
+    'patch': ESMF.RegridMethod.PATCH,
+    'nearest_s2d': ESMF.RegridMethod.NEAREST_STOD,
+    'nearest_d2s': ESMF.RegridMethod.NEAREST_DTOS,
+}
+
+# use shorter, clearer names for options in ESMF.ExtrapMethod
+_extrap_dict = {
+    'inverse_dist': ESMF.ExtrapMethod.NEAREST_IDAVG,
+    'nearest_s2d': ESMF.ExtrapMethod.NEAREST_STOD,
+    None: None,
+}
+
+
+# Process-level LRU cache for esmf_regrid_build(..., return_plan=True).
+# Weight generation is by far the dominant cost when building many
+# short-lived regridders, so identical rebuilds are worth skipping.
+# Only weights-only RegridPlan objects are cached: handing out a shared
+# live ESMF.Regrid would let one caller destroy another's regrid, and
+# would pin Fortran-side field/grid memory for the cache's lifetime.
+ESMF_REGRID_CACHE_MAXSIZE = 16
+_regrid_cache = OrderedDict()
+
+
+def _grid_cache_token(grid):
+    """
+    Hash the coordinates (and mask) of an ESMF.Grid into a cache token.
+
+    Return None for other grid types (Mesh, LocStream), which are then
+    not cached.
+
+    Parameters
+    ----------
+    grid : ESMF.Grid, Mesh or LocStream object
+
+    Returns
+    -------
+    token : str or None
+    """
+    if not isinstance(grid, ESMF.Grid):
+        return None
+
+    h = hashlib.sha1()
+    for coords in grid.coords:
+        for a in coords:
+            if a is not None:
+                # shape and dtype matter too: differently-shaped grids
+                # can share identical raw bytes
+                h.update(str((a.shape, a.dtype)).encode())
+                h.update(np.ascontiguousarray(a))
+    if (grid.mask is not None) and (grid.mask[0] is not None):
+        h.update(str(grid.mask[0].shape).encode())
+        h.update(np.ascontiguousarray(grid.mask[0]))
+    h.update(str(grid.periodic_dim).encode())
+    return h.hexdigest()
+
+
+def _regrid_cache_key(
+    sourcegrid,
+    destgrid,
+    method,
+    extra_dims,
+    extrap_method,
+    extrap_dist_exponent,
+    extrap_num_src_pnts,
+    ignore_degenerate,
+    weight_dtype,
+):
+    """
+    Cache key for a weight computation, or None if it cannot be cached
+    (Mesh or LocStream grids).
+    """
+    token_in = _grid_cache_token(sourcegrid)
+    token_out = _grid_cache_token(destgrid)
+    if (token_in is None) or (token_out is None):
+        return None
+    return (
+        token_in,
+        token_out,
+        method,
+        tuple(extra_dims or ()),
+        extrap_method,
+        extrap_dist_exponent,
+        extrap_num_src_pnts,
+        ignore_degenerate,
+        None if weight_dtype is None else np.dtype(weight_dtype).str,
+    )
+
+
 def esmf_regrid_build(
     sourcegrid,
     destgrid,
@@ -322,6 +631,9 @@ def esmf_regrid_build(
     extrap_dist_exponent=None,
     extrap_num_src_pnts=None,
     ignore_degenerate=None,
+    reuse_weights=False,
+    return_plan=False,
+    weight_dtype=None,
 ):
     """
     Create an ESMF.Regrid object, containing regridding weights.
@@ -380,38 +692,174 @@ def esmf_regrid_build(
         If False (default), raise error if grids contain degenerated cells
         (i.e. triangles or lines, instead of quadrilaterals)
 
+    reuse_weights : bool, optional
+        Whether to read existing weights back from ``filename`` instead
+        of computing them, returning a ``RegridPlan`` and skipping ESMF's
+        weight generation entirely. The grid sizes recorded in the file
+        are checked against the given grids, but the regridding method is
+        not recorded there and cannot be verified.
+        False by default (i.e. re-compute, not reuse), in which case an
+        already existing file at ``filename`` is an error.
+
+    return_plan : bool, optional
+        If True, extract the weights to a scipy.sparse CSR matrix right
+        away, destroy the ESMF regrid and field objects, and return a
+        ``RegridPlan`` instead of a live ESMF.Regrid. The plan can be
+        passed to ``esmf_regrid_apply()`` like a regrid object, but holds
+        no Fortran-side memory. Default to False.
+
+    weight_dtype : numpy dtype, optional
+        Cast the extracted weights to this dtype (e.g. ``np.float32``)
+        for the scipy-based apply path. Regridding weights rarely need
+        more than single precision, and the sparse apply is memory-bound,
+        so halving the bytes per weight roughly doubles its throughput.
+        If None (default), keep ESMF's float64. Does not affect ESMPy's
+        online regridding or the offline weight file.
+
     Returns
     -------
-    grid : ESMF.Grid object
+    regrid : ESMF.Regrid object, or RegridPlan if ``return_plan=True``
+
+    Notes
+    -----
+    With ``return_plan=True``, results are cached at the process level,
+    keyed on the grid coordinates and the regridding options, so building
+    the same plan twice in one session skips ESMF's expensive weight
+    generation. The cache keeps at most ``ESMF_REGRID_CACHE_MAXSIZE``
+    entries. Live ESMF.Regrid objects are never cached: sharing one
+    between callers would let ``esmf_regrid_finalize()`` in one place
+    destroy the other's regrid, and would pin Fortran-side memory.
+    """
+
+    # Warm start: read the weights back from disk instead of re-running
+    # ESMF's full weight generation (which can take days of HPC time for
+    # high-res grids). Opt-in, like the frontend's reuse_weights.
+    if reuse_weights:
+        if filename is None:
+            raise ValueError('To reuse weights, you need to provide filename.')
+        return _load_regrid_plan(filename, sourcegrid, destgrid, weight_dtype)
+
+    # ESMPy will throw an incomprehensive error if the weight file
+    # already exists. Better to catch it here!
+    if filename is not None:
+        assert not os.path.exists(
+            filename
+        ), 'Weight file already exists! Please remove it or use a new name.'
+
+    cache_key = None
+    if return_plan:
+        cache_key = _regrid_cache_key(
+            sourcegrid,
+            destgrid,
+            method,
+            extra_dims,
+            extrap_method,
+            extrap_dist_exponent,
+            extrap_num_src_pnts,
+            ignore_degenerate,
+            weight_dtype,
+        )
+        plan = _regrid_cache.get(cache_key) if cache_key is not None else None
+        if plan is not None:
+            _regrid_cache.move_to_end(cache_key)
+            return plan
+
+    regrid = _build_regrid(
+        sourcegrid,
+        destgrid,
+        method,
+        filename,
+        extra_dims,
+        extrap_method,
+        extrap_dist_exponent,
+        extrap_num_src_pnts,
+        ignore_degenerate,
+        weight_dtype,
+    )
+
+    if not return_plan:
+        return regrid
+
+    # extract the weights now and release the Fortran-side memory;
+    # only the sparse matrix and the shapes are needed to apply
+    plan = RegridPlan(regrid_to_csr(regrid), regrid.shape_in, regrid.shape_out)
+    esmf_regrid_finalize(regrid)
+
+    if cache_key is not None:
+        _regrid_cache[cache_key] = plan
+        while len(_regrid_cache) > ESMF_REGRID_CACHE_MAXSIZE:
+            _regrid_cache.popitem(last=False)
+
+    return plan
+
 
+def _load_regrid_plan(filename, sourcegrid, destgrid, weight_dtype=None):
     """
+    Build a RegridPlan from an existing offline weight file,
+    skipping ESMF's weight generation entirely.
 
-    # use shorter, clearer names for options in ESMF.RegridMethod
-    method_dict = {
-        'bilinear': ESMF.RegridMethod.BILINEAR,
-        'conservative': ESMF.RegridMethod.CONSERVE,
-        'conservative_normed': ESMF.RegridMethod.CONSERVE,
-        'patch': ESMF.RegridMethod.PATCH,
-        'nearest_s2d': ESMF.RegridMethod.NEAREST_STOD,
-        'nearest_d2s': ESMF.RegridMethod.NEAREST_DTOS,
-    }
-    try:
-        esmf_regrid_method = method_dict[method]
-    except Exception:
-        raise ValueError('method should be chosen from ' '{}'.format(list(method_dict.keys())))
-
-    # use shorter, clearer names for options in ESMF.ExtrapMethod
-    extrap_dict = {
-        'inverse_dist': ESMF.ExtrapMethod.NEAREST_IDAVG,
-        'nearest_s2d': ESMF.ExtrapMethod.NEAREST_STOD,
-        None: None,
-    }
-    try:
-        esmf_extrap_method = extrap_dict[extrap_method]
-    except KeyError:
+    Parameters
+    ----------
+    filename : str
+        Path to the weights netCDF file written by ESMF.
+
+    sourcegrid, destgrid : ESMF.Grid or ESMF.Mesh object
+        Source and destination grids the weights map between.
+
+    weight_dtype : numpy dtype, optional
+        See ``esmf_regrid_build()``.
+
+    Returns
+    -------
+    plan : RegridPlan
+    """
+    if not os.path.exists(filename):
+        raise IOError(f'Weights file not found on disk.\n{filename}')
+
+    # shapes must match field.data.shape (1D for Mesh/LocStream),
+    # which is how esmf_regrid_apply() splits off the extra dimensions
+    shape_in = _field_data_shape(sourcegrid)
+    shape_out = _field_data_shape(destgrid)
+    n_in = int(np.prod(shape_in))
+    n_out = int(np.prod(shape_out))
+
+    row, col, s = _read_weights_file(filename, n_in, n_out)
+    if weight_dtype is not None:
+        s = s.astype(weight_dtype)
+    weights = scipy.sparse.csr_matrix((s, (row, col)), shape=(n_out, n_in))
+    return RegridPlan(weights, shape_in, shape_out)
+
+
+def _build_regrid(
+    sourcegrid,
+    destgrid,
+    method,
+    filename,
+    extra_dims,
+    extrap_method,
+    extrap_dist_exponent,
+    extrap_num_src_pnts,
+    ignore_degenerate,
+    weight_dtype,
+):
+    """
+    Validate the regridding options and construct the ESMF.Regrid object.
+
+    This is the cache- and plan-agnostic core of ``esmf_regrid_build()``;
+    see there for the meaning of the arguments.
+    """
+
+    # .get() plus an explicit check is cheaper than installing an
+    # exception frame on every call
+    esmf_regrid_method = _method_dict.get(method)
+    if esmf_regrid_method is None:
+        raise ValueError('method should be chosen from ' '{}'.format(list(_method_dict.keys())))
+
+    if extrap_method not in _extrap_dict:
         raise KeyError(
-            '`extrap_method` should be chosen from ' '{}'.format(list(extrap_dict.keys()))
+            '`extrap_method` should be chosen from ' '{}'.format(list(_extrap_dict.keys()))
         )
+    esmf_extrap_method = _extrap_dict[extrap_method]
 
     # until ESMPy updates ESMP_FieldRegridStoreFile, extrapolation is not possible
     # if files are written on disk
@@ -433,14 +881,8 @@ def esmf_regrid_build(
     # ESMF.Regrid requires Field (Grid+data) as input, not just Grid.
     # Extra dimensions are specified when constructing the Field objects,
     # not when constructing the Regrid object later on.
-    if isinstance(sourcegrid, ESMF.Mesh):
-        sourcefield = ESMF.Field(sourcegrid, meshloc=ESMF.MeshLoc.ELEMENT, ndbounds=extra_dims)
-    else:
-        sourcefield = ESMF.Field(sourcegrid, ndbounds=extra_dims)
-    if isinstance(destgrid, ESMF.Mesh):
-        destfield = ESMF.Field(destgrid, meshloc=ESMF.MeshLoc.ELEMENT, ndbounds=extra_dims)
-    else:
-        destfield = ESMF.Field(destgrid, ndbounds=extra_dims)
+    sourcefield = _make_field(sourcegrid, extra_dims)
+    destfield = _make_field(destgrid, extra_dims)
 
     # ESMF bug? when using locstream objects, options src_mask_values
     # and dst_mask_values produce runtime errors
@@ -450,13 +892,6 @@ def esmf_regrid_build(
     if isinstance(destfield.grid, ESMF.api.locstream.LocStream):
         allow_masked_values = False
 
-    # ESMPy will throw an incomprehensive error if the weight file
-    # already exists. Better to catch it here!
-    if filename is not None:
-        assert not os.path.exists(
-            filename
-        ), 'Weight file already exists! Please remove it or use a new name.'
-
     # re-normalize conservative regridding results
     # https://github.com/JiaweiZhuang/xESMF/issues/17
     if method == 'conservative_normed':
@@ -483,20 +918,108 @@ def esmf_regrid_build(
 
     regrid = ESMF.Regrid(sourcefield, destfield, **kwargs)
 
+    # Record shape information for the scipy-based apply path.
+    # ESMPy only keeps the flattened factor indices, so the grid shapes
+    # cannot be recovered from the Regrid object alone.
+    n_extra = 0 if extra_dims is None else len(extra_dims)
+    regrid.shape_in = sourcefield.data.shape[: sourcefield.data.ndim - n_extra]
+    regrid.shape_out = destfield.data.shape[: destfield.data.ndim - n_extra]
+    regrid.weights_file = filename
+    regrid.weight_dtype = weight_dtype
+
+    # pool of per-shape Field pairs for esmf_regrid_apply(),
+    # primed with the fields the regrid was built with
+    regrid._field_pool = {tuple(extra_dims or ()): (sourcefield, destfield)}
+
     return regrid
 
 
-def esmf_regrid_apply(regrid, indata):
+def regrid_to_csr(regrid):
     """
-    Apply existing regridding weights to the data field,
-    using ESMPy's built-in functionality.
+    Extract regridding weights into a scipy.sparse CSR matrix.
 
-    xESMF use Scipy to apply weights instead of this.
-    This is only for benchmarking Scipy's result and performance.
+    The matrix has shape ``(N_out, N_in)``, with N_in/N_out the total
+    number of grid boxes in the input/output grids. It is built only once
+    and then cached on ``regrid``, so repeated calls (e.g. from
+    ``esmf_regrid_apply()``) are cheap.
 
     Parameters
     ----------
     regrid : ESMF.Regrid object
+        Generated by ``esmf_regrid_build()``. If the regrid was built with
+        the ``filename`` option, the weights are read back from the offline
+        file, because ESMPy does not keep the factors in memory in that case.
+
+    Returns
+    -------
+    weights : scipy.sparse.csr_matrix
+    """
+
+    weights = getattr(regrid, '_weights_csr', None)
+    if weights is not None:
+        return weights
+
+    n_in = int(np.prod(regrid.shape_in))
+    n_out = int(np.prod(regrid.shape_out))
+
+    if regrid.weights_file is not None:
+        # Offline regrids are built with factors=False, so the weights
+        # only exist in the file written by ESMF.
+        row, col, s = _read_weights_file(regrid.weights_file, n_in, n_out)
+    else:
+        w = regrid.get_weights_dict(deep_copy=True)
+        col = w['col_src'] - 1
+        row = w['row_dst'] - 1
+        s = w['weights']
+
+    weight_dtype = getattr(regrid, 'weight_dtype', None)
+    if weight_dtype is not None:
+        s = s.astype(weight_dtype)
+
+    weights = scipy.sparse.csr_matrix((s, (row, col)), shape=(n_out, n_in))
+    regrid._weights_csr = weights
+    return weights
+
+
+def _weights_to_gpu(regrid, weights):
+    """
+    Copy the CSR weights to the GPU, caching the device matrix on
+    ``regrid`` so the transfer only happens on the first GPU apply.
+
+    Parameters
+    ----------
+    regrid : ESMF.Regrid or RegridPlan object
+
+    weights : scipy.sparse.csr_matrix
+
+    Returns
+    -------
+    weights : cupyx.scipy.sparse.csr_matrix
+    """
+    weights_gpu = getattr(regrid, '_weights_gpu', None)
+    if weights_gpu is None:
+        weights_gpu = cupyx.scipy.sparse.csr_matrix(weights)
+        regrid._weights_gpu = weights_gpu
+    return weights_gpu
+
+
+def esmf_regrid_apply(regrid, indata, use_esmpy=False):
+    """
+    Apply existing regridding weights to the data field.
+
+    By default, the weights are extracted once into a scipy.sparse CSR
+    matrix (see ``regrid_to_csr()``) and applied as a single sparse matrix
+    multiplication, which batches all extra dimensions into one operation.
+    This avoids ESMPy's per-call Fortran overhead and is much faster for
+    realistic extra dimensions.
+
+    If ``indata`` is a CuPy array, the weights are copied to the device
+    on the first call and applied with cuSPARSE, so the data never leaves
+    the GPU. Requires the optional ``cupy`` dependency.
+
+    Parameters
+    ----------
+    regrid : ESMF.Regrid or RegridPlan object
         Contains the mapping from the source grid to the destination grid.
 
         Users should create them by esmf_regrid_build(),
@@ -508,30 +1031,67 @@ def esmf_regrid_apply(regrid, indata):
 
         Recommend Fortran-ordering to match ESMPy internal.
 
+    use_esmpy : bool, optional
+        Apply the weights with ESMPy's built-in (Fortran-level) online
+        regridding instead of scipy. Slower; only kept for benchmarking
+        against the scipy path.
+
     Returns
     -------
     outdata : numpy array of shape ``(Nlon_out, Nlat_out, N1, N2, ...)``
 
     """
 
-    # Passing C-ordered input data will be terribly slow,
-    # since indata is often quite large and re-ordering memory is expensive.
-    warn_f_contiguous(indata)
+    if use_esmpy:
+        if isinstance(regrid, RegridPlan):
+            raise TypeError('use_esmpy=True needs a live ESMF.Regrid object, not a RegridPlan.')
+
+        # No layout warning here: the copy below picks a layout-aware
+        # strategy for C-ordered input, and the apply call is too hot for
+        # per-call Python warning machinery anyway.
+
+        # Get source and destination fields matching the data shape.
+        # Because the regrid object points to its underlying field&grid,
+        # we can just pass regrid from ESMF_regrid_build() to ESMF_regrid_apply(),
+        # without having to pass all the field&grid objects.
+        extra_shape = indata.shape[len(regrid.shape_in) :]
+        sourcefield, destfield = _get_pooled_fields(regrid, extra_shape)
+
+        # pass numpy array to the underlying Fortran array.
+        # numpy picks its own iteration order for the assignment, so no
+        # spelling of the copy avoids the stride mismatch for C-ordered
+        # input; only very large copies are worth the explicit tiling.
+        # 1D (Mesh/LocStream) data has no layout mismatch to fix.
+        big = indata.nbytes > RELAYOUT_NBYTES_THRESHOLD
+        if indata.flags['C_CONTIGUOUS'] and (indata.ndim >= 2) and big:
+            _relayout_blocked(sourcefield.data, indata)
+        else:
+            sourcefield.data[...] = indata
 
-    # Get the pointers to source and destination fields.
-    # Because the regrid object points to its underlying field&grid,
-    # we can just pass regrid from ESMF_regrid_build() to ESMF_regrid_apply(),
-    # without having to pass all the field&grid objects.
-    sourcefield = regrid.srcfield
-    destfield = regrid.dstfield
+        # apply regridding weights
+        destfield = regrid(sourcefield, destfield)
 
-    # pass numpy array to the underlying Fortran array
-    sourcefield.data[...] = indata
+        return destfield.data
 
-    # apply regridding weights
-    destfield = regrid(sourcefield, destfield)
+    if isinstance(regrid, RegridPlan):
+        weights = regrid.weights
+    else:
+        weights = regrid_to_csr(regrid)
+    extra_shape = indata.shape[len(regrid.shape_in) :]
+
+    # Fold the extra dimensions into a single batch dimension, so the
+    # weights are applied to all of them with one matrix multiplication.
+    # Fortran ordering matches the field layout used by ESMPy.
+    indata_flat = indata.reshape(weights.shape[1], -1, order='F')
+
+    if isinstance(indata, cupy_array_type):
+        # data already lives on the GPU: apply with cuSPARSE instead of
+        # shipping it across PCIe just to use the CPU weights
+        outdata_flat = _weights_to_gpu(regrid, weights).dot(indata_flat)
+    else:
+        outdata_flat = apply_csr(weights, indata_flat)
 
-    return destfield.data
+    return outdata_flat.reshape(*regrid.shape_out, *extra_shape, order='F')
 
 
 def esmf_regrid_finalize(regrid):
@@ -543,11 +1103,19 @@ def esmf_regrid_finalize(regrid):
 
     Parameters
     ----------
-    regrid : ESMF.Regrid object
+    regrid : ESMF.Regrid or RegridPlan object
 
     """
 
+    if isinstance(regrid, RegridPlan):
+        # plans hold no ESMF objects, so there is nothing to free
+        return
+
     regrid.destroy()
+    # this covers regrid.srcfield/dstfield, which prime the pool
+    for sourcefield, destfield in getattr(regrid, '_field_pool', {}).values():
+        sourcefield.destroy()
+        destfield.destroy()
     regrid.srcfield.destroy()
     regrid.dstfield.destroy()
     # regrid.srcfield.grid.destroy()
@@ -6,13 +6,17 @@ except ImportError:
     import ESMF
 import numpy as np
 import pytest
+import scipy.sparse
 import xarray as xr
 from numpy.testing import assert_almost_equal, assert_equal
 
 import xesmf as xe
+from xesmf._smm_numba import apply_csr
 from xesmf.backend import (
     Grid,
     LocStream,
+    RegridPlan,
+    _regrid_cache,
     add_corner,
     esmf_regrid_apply,
     esmf_regrid_build,
@@ -127,7 +131,7 @@ def test_esmf_extrapolation():
     grid_out = Grid.from_xarray(lon_out.T, lat_out.T)
 
     regrid = esmf_regrid_build(grid_in, grid_out, 'bilinear')
-    data_out_esmpy = esmf_regrid_apply(regrid, data_in.T).T
+    data_out_esmpy = esmf_regrid_apply(regrid, data_in.T, use_esmpy=True).T
     # without extrapolation, the first and last lines/columns = 0
     assert data_out_esmpy[0, 0] == 0
 
@@ -139,7 +143,7 @@ def test_esmf_extrapolation():
         extrap_num_src_pnts=3,
         extrap_dist_exponent=1,
     )
-    data_out_esmpy = esmf_regrid_apply(regrid, data_in.T).T
+    data_out_esmpy = esmf_regrid_apply(regrid, data_in.T, use_esmpy=True).T
     # the 3 closest points in data_in are 2.010, 2.005, and 1.992. The result should be roughly equal to 2.0
     assert np.round(data_out_esmpy[0, 0], 1) == 2.0
 
@@ -171,7 +175,7 @@ def test_regrid():
     assert regrid.regrid_method is ESMF.RegridMethod.CONSERVE
 
     # apply regridding using ESMPy's native method
-    data_out_esmpy = esmf_regrid_apply(regrid, data_in.T).T
+    data_out_esmpy = esmf_regrid_apply(regrid, data_in.T, use_esmpy=True).T
 
     rel_err = (data_out_esmpy - data_ref) / data_ref  # relative error
     assert np.max(np.abs(rel_err)) < 0.05
@@ -209,7 +213,7 @@ def test_regrid_periodic_wrong():
     assert grid_in.periodic_dim is None
 
     regrid = esmf_regrid_build(grid_in, grid_out, 'bilinear')
-    data_out_esmpy = esmf_regrid_apply(regrid, data_in.T).T
+    data_out_esmpy = esmf_regrid_apply(regrid, data_in.T, use_esmpy=True).T
 
     rel_err = (data_out_esmpy - data_ref) / data_ref  # relative error
     assert np.max(np.abs(rel_err)) == 1.0  # some data will be missing
@@ -228,7 +232,7 @@ def test_regrid_periodic_correct():
     assert grid_in.periodic_dim == 0  # the first axis, longitude
 
     regrid = esmf_regrid_build(grid_in, grid_out, 'bilinear')
-    data_out_esmpy = esmf_regrid_apply(regrid, data_in.T).T
+    data_out_esmpy = esmf_regrid_apply(regrid, data_in.T, use_esmpy=True).T
 
     rel_err = (data_out_esmpy - data_ref) / data_ref  # relative error
     assert np.max(np.abs(rel_err)) < 0.065
@@ -236,6 +240,171 @@ def test_regrid_periodic_correct():
     esmf_regrid_finalize(regrid)
 
 
+def test_esmpy_apply_pooled_fields():
+
+    grid_in = Grid.from_xarray(lon_in.T, lat_in.T, periodic=True)
+    grid_out = Grid.from_xarray(lon_out.T, lat_out.T)
+
+    # build WITHOUT extra_dims: applying 4D data below has to create
+    # new fields through the pool's miss path and reuse the routehandle
+    # on them
+    regrid = esmf_regrid_build(grid_in, grid_out, 'bilinear')
+
+    data4d = data4D_in.T  # [Nlon, Nlat, Nlev, Ntime], Fortran-style
+    extra_shape = data4d.shape[2:]
+    data4d_out_esmpy = esmf_regrid_apply(regrid, data4d, use_esmpy=True).copy()
+    assert extra_shape in regrid._field_pool
+
+    # must match the scipy path, which needs no field objects at all
+    data4d_out_scipy = esmf_regrid_apply(regrid, data4d)
+    assert_almost_equal(data4d_out_esmpy, data4d_out_scipy)
+
+    # a second apply with the same extra dimensions reuses the fields
+    fields = regrid._field_pool[extra_shape]
+    data4d_out2 = esmf_regrid_apply(regrid, data4d, use_esmpy=True)
+    assert regrid._field_pool[extra_shape] is fields
+    assert_almost_equal(data4d_out2, data4d_out_esmpy)
+
+    esmf_regrid_finalize(regrid)
+
+
+def test_regrid_plan():
+
+    grid_in = Grid.from_xarray(lon_in.T, lat_in.T, periodic=True)
+    grid_out = Grid.from_xarray(lon_out.T, lat_out.T)
+
+    regrid = esmf_regrid_build(grid_in, grid_out, 'bilinear')
+    data_out = esmf_regrid_apply(regrid, data_in.T).T
+
+    # the scipy path must agree with ESMPy's own online regridding,
+    # so a flatten-order or index-convention bug cannot slip through
+    data_out_esmpy = esmf_regrid_apply(regrid, data_in.T, use_esmpy=True).T
+    assert_almost_equal(data_out, data_out_esmpy)
+
+    # ... and with the analytical reference (same bound as the
+    # periodic bilinear case in test_regrid_periodic_correct)
+    rel_err = (data_out - data_ref) / data_ref
+    assert np.max(np.abs(rel_err)) < 0.065
+
+    plan = esmf_regrid_build(grid_in, grid_out, 'bilinear', return_plan=True)
+    assert isinstance(plan, RegridPlan)
+    assert plan.shape_in == lon_in.T.shape
+    assert plan.shape_out == lon_out.T.shape
+
+    # the plan must reproduce the live regrid's scipy apply exactly
+    data_out_plan = esmf_regrid_apply(plan, data_in.T).T
+    assert_almost_equal(data_out_plan, data_out)
+
+    # plans hold no ESMF objects, so ESMPy's online path cannot use them
+    with pytest.raises(TypeError):
+        esmf_regrid_apply(plan, data_in.T, use_esmpy=True)
+
+    # ... and finalizing one is a harmless no-op
+    esmf_regrid_finalize(plan)
+    esmf_regrid_finalize(regrid)
+
+
+def test_regrid_weight_dtype():
+
+    grid_in = Grid.from_xarray(lon_in.T, lat_in.T, periodic=True)
+    grid_out = Grid.from_xarray(lon_out.T, lat_out.T)
+
+    plan = esmf_regrid_build(grid_in, grid_out, 'bilinear', return_plan=True)
+    plan32 = esmf_regrid_build(
+        grid_in, grid_out, 'bilinear', return_plan=True, weight_dtype=np.float32
+    )
+    assert plan.weights.dtype == np.float64
+    assert plan32.weights.dtype == np.float32
+
+    # single-precision weights only cost a little accuracy
+    data_out = esmf_regrid_apply(plan, data_in.T).T
+    data_out32 = esmf_regrid_apply(plan32, data_in.T).T
+    assert_almost_equal(data_out32, data_out, decimal=5)
+
+
+def test_regrid_plan_cache():
+    _regrid_cache.clear()
+
+    grid_in = Grid.from_xarray(lon_in.T, lat_in.T, periodic=True)
+    grid_out = Grid.from_xarray(lon_out.T, lat_out.T)
+
+    plan = esmf_regrid_build(grid_in, grid_out, 'bilinear', return_plan=True)
+    assert len(_regrid_cache) == 1
+
+    # same grids and options: the cached plan is returned as-is
+    plan2 = esmf_regrid_build(grid_in, grid_out, 'bilinear', return_plan=True)
+    assert plan2 is plan
+
+    # the key depends on the coordinates, not the grid object identity
+    grid_in2 = Grid.from_xarray(lon_in.T, lat_in.T, periodic=True)
+    plan3 = esmf_regrid_build(grid_in2, grid_out, 'bilinear', return_plan=True)
+    assert plan3 is plan
+
+    # different options miss the cache
+    plan4 = esmf_regrid_build(grid_in, grid_out, 'nearest_s2d', return_plan=True)
+    assert plan4 is not plan
+    assert len(_regrid_cache) == 2
+
+    # live regrids are never cached
+    regrid = esmf_regrid_build(grid_in, grid_out, 'bilinear')
+    assert len(_regrid_cache) == 2
+    esmf_regrid_finalize(regrid)
+
+    _regrid_cache.clear()
+
+
+def test_regrid_reuse_weights(tmp_path):
+    fn = str(tmp_path / 'weights.nc')
+
+    grid_in = Grid.from_xarray(lon_in.T, lat_in.T, periodic=True)
+    grid_out = Grid.from_xarray(lon_out.T, lat_out.T)
+
+    regrid = esmf_regrid_build(grid_in, grid_out, 'bilinear', filename=fn)
+    data_out = esmf_regrid_apply(regrid, data_in.T).T
+    esmf_regrid_finalize(regrid)
+
+    # without reuse_weights, an existing file is still an error
+    with pytest.raises(AssertionError):
+        esmf_regrid_build(grid_in, grid_out, 'bilinear', filename=fn)
+
+    # warm start: read the weights back instead of regenerating them
+    plan = esmf_regrid_build(grid_in, grid_out, 'bilinear', filename=fn, reuse_weights=True)
+    assert isinstance(plan, RegridPlan)
+    assert_almost_equal(esmf_regrid_apply(plan, data_in.T).T, data_out)
+
+    # the file records the grid sizes, so swapped grids are caught
+    with pytest.raises(ValueError):
+        esmf_regrid_build(grid_out, grid_in, 'bilinear', filename=fn, reuse_weights=True)
+
+    # reuse needs a filename, and the file must exist
+    with pytest.raises(ValueError):
+        esmf_regrid_build(grid_in, grid_out, 'bilinear', reuse_weights=True)
+    with pytest.raises(IOError):
+        esmf_regrid_build(
+            grid_in, grid_out, 'bilinear', filename=str(tmp_path / 'missing.nc'), reuse_weights=True
+        )
+
+
+def test_apply_csr_layouts():
+    # pure numpy/scipy test of the threaded SMM kernel against scipy's
+    rng = np.random.default_rng(42)
+    weights = scipy.sparse.random(50, 80, density=0.1, format='csr', random_state=42)
+    data = rng.standard_normal((80, 30))
+    expected = weights.dot(data)
+
+    # C-contiguous input: row-parallel kernel
+    assert_almost_equal(apply_csr(weights, np.ascontiguousarray(data)), expected)
+
+    # F-contiguous input: batch-major kernel, F-ordered output so the
+    # order='F' unflatten in esmf_regrid_apply() stays a view
+    out = apply_csr(weights, np.asfortranarray(data))
+    assert out.flags['F_CONTIGUOUS']
+    assert_almost_equal(out, expected)
+
+    # single batch column (degenerate but common for 2D-only data)
+    assert_almost_equal(apply_csr(weights, data[:, :1].copy()), expected[:, :1])
+
+
 def test_esmf_locstream():
     lon = np.arange(5)
     lat = np.arange(5)